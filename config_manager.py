@@ -1,6 +1,9 @@
 import json
+import logging
 import os
 
+log = logging.getLogger(__name__)
+
 class ConfigManager:
     DEFAULT_CONFIG = {
         "font_family": "Arial",
@@ -12,7 +15,16 @@ class ConfigManager:
         "alignment": "Custom",
         "locked": False,
         "click_through": False,
-        "provider": "Auto"
+        "provider": "Auto",
+        "secondary_lyric": "Translation",
+        "pinned_app": "",
+        "prefer_playing": True,
+        "blocked_apps": [],
+        "log_level": "INFO",
+        "log_file": "desktop_lyrics.log",
+        "push_server_enabled": False,
+        "push_server_host": "127.0.0.1",
+        "push_server_port": 8765
     }
     
     CONFIG_FILE = "config.json"
@@ -33,7 +45,7 @@ class ConfigManager:
                 config.update(saved_config)
                 return config
         except Exception as e:
-            print(f"Error loading config: {e}")
+            log.error("Error loading config: %s", e)
             return self.DEFAULT_CONFIG.copy()
 
     def save_config(self):
@@ -41,7 +53,7 @@ class ConfigManager:
             with open(self.CONFIG_FILE, 'w') as f:
                 json.dump(self.config, f, indent=4)
         except Exception as e:
-            print(f"Error saving config: {e}")
+            log.error("Error saving config: %s", e)
 
     def get(self, key):
         return self.config.get(key, self.DEFAULT_CONFIG.get(key))
@@ -60,4 +72,4 @@ class ConfigManager:
             try:
                 callback()
             except Exception as e:
-                print(f"Error in config listener: {e}")
+                log.exception("Error in config listener: %s", e)
@@ -0,0 +1,172 @@
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+class RateLimitFilter(logging.Filter):
+    """Drops repeats of the same message within `interval` seconds.
+
+    Messages are keyed by logger, level and the formatted text, so only
+    identical lines (e.g. the same "Monitor error" ten times a second) are
+    collapsed; different songs or errors always get through. The next copy
+    let through carries the number of repeats swallowed in the meantime.
+    """
+
+    def __init__(self, interval=10.0, max_keys=1000):
+        super().__init__()
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.seen = {} # key -> [last_emitted, suppressed_count]
+        self.max_keys = max_keys
+
+    def prune(self, now):
+        # Every distinct message gets a key; forget expired ones with nothing to report
+        for key, state in list(self.seen.items()):
+            if not state[1] and now - state[0] >= self.interval:
+                del self.seen[key]
+
+    def filter(self, record):
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+
+        with self.lock:
+            state = self.seen.get(key)
+            if state is None:
+                if len(self.seen) >= self.max_keys:
+                    self.prune(now)
+                self.seen[key] = [now, 0]
+                return True
+            if now - state[0] < self.interval:
+                state[1] += 1
+                return False
+            suppressed = state[1]
+            state[0] = now
+            state[1] = 0
+
+        if suppressed:
+            # Keep the formatted text so the suffix can't clash with % args
+            record.msg = f"{key[2]} (repeated {suppressed} times)"
+            record.args = None
+        return True
+
+    def flush(self):
+        """Returns (key, count) pairs of repeats that were never reported."""
+        with self.lock:
+            pending = [(key, state[1]) for key, state in self.seen.items() if state[1]]
+            self.seen.clear()
+        return pending
+
+    def flush_expired(self):
+        """Like flush, but only for bursts that ended at least `interval` ago.
+
+        Without this a storm that stops is only reported when the same line
+        comes back. The key is kept, so that next copy gets no suffix.
+        """
+        now = time.monotonic()
+        pending = []
+        with self.lock:
+            for key, state in self.seen.items():
+                if state[1] and now - state[0] >= self.interval:
+                    pending.append((key, state[1]))
+                    state[1] = 0
+        return pending
+
+class LogManager:
+    """Routes all records through a queue to console/file handlers.
+
+    Callers pay for the level check, the rate limit filter, formatting the
+    record (QueueHandler.prepare does that on the calling thread) and a
+    queue put; only the console/file I/O runs on the QueueListener's thread.
+    """
+
+    def __init__(self):
+        self.listener = None
+        self.queue_handler = None
+        self.rate_limit = None
+        self.summary_thread = None
+        self.summary_stop = None
+
+    def setup(self, level="INFO", log_file=None, max_bytes=1024 * 1024, backup_count=3, rate_limit_interval=10.0):
+        self.shutdown()
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = []
+
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(formatter)
+        handlers.append(console)
+
+        file_error = None
+        if log_file:
+            try:
+                file_handler = logging.handlers.RotatingFileHandler(
+                    log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+                )
+                file_handler.setFormatter(formatter)
+                handlers.append(file_handler)
+            except OSError as e:
+                file_error = e
+
+        log_queue = queue.SimpleQueue()
+        self.rate_limit = RateLimitFilter(rate_limit_interval)
+        self.queue_handler = logging.handlers.QueueHandler(log_queue)
+        self.queue_handler.addFilter(self.rate_limit)
+
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+        root.addHandler(self.queue_handler)
+
+        self.listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+        if file_error:
+            logging.getLogger(__name__).error("Error opening log file %s: %s", log_file, file_error)
+
+        # Reports "repeated N times" for bursts that have ended
+        self.summary_stop = threading.Event()
+        self.summary_thread = threading.Thread(
+            target=self.report_summaries, args=(self.summary_stop, rate_limit_interval),
+            name="log-summaries", daemon=True
+        )
+        self.summary_thread.start()
+
+    def report_summaries(self, stop, interval):
+        while not stop.wait(interval):
+            self.emit_summaries(self.rate_limit.flush_expired())
+
+    def emit_summaries(self, pending):
+        # Logged at the original level and enqueued directly, skipping the limiter
+        root = logging.getLogger()
+        for (name, levelno, message), count in pending:
+            if not root.isEnabledFor(levelno):
+                continue
+            record = logging.LogRecord(
+                name, levelno, __file__, 0, "%s (repeated %d more times)", (message, count), None
+            )
+            self.queue_handler.emit(record)
+
+    def set_level(self, level):
+        logging.getLogger().setLevel(getattr(logging, str(level).upper(), logging.INFO))
+
+    def shutdown(self):
+        if not self.listener:
+            return
+
+        self.summary_stop.set()
+        self.summary_thread.join()
+        self.emit_summaries(self.rate_limit.flush())
+
+        logging.getLogger().removeHandler(self.queue_handler)
+        self.listener.stop() # Drains the queue before returning
+        for handler in self.listener.handlers:
+            handler.close()
+
+        self.listener = None
+        self.queue_handler = None
+        self.rate_limit = None
+        self.summary_thread = None
+        self.summary_stop = None
@@ -1,45 +1,97 @@
+import bisect
+import logging
 import syncedlyrics
 import re
+import threading
+from collections import namedtuple
+from syncedlyrics.providers import NetEase
+
+log = logging.getLogger(__name__)
+
+# One entry of the merged timeline; translation/romanization are "" when missing
+LyricLine = namedtuple("LyricLine", ["time", "text", "translation", "romanization"])
+
+# syncedlyrics' default order minus NetEase, which Auto has already tried
+AUTO_FALLBACK_PROVIDERS = ["Musixmatch", "Lrclib", "Megalobiz", "Genius"]
+
+# Secondary LRCs are timed separately and can be off by a few centiseconds
+MERGE_TOLERANCE = 0.5
 
 class LyricsFetcher:
     def __init__(self):
         self.current_query = ""
         self.lyrics_cache = {}
+        self.netease = None # Reused so its session cookies/connection survive between songs
+        # Fetches run on executor threads and can overlap on quick track skips;
+        # requests.Session isn't safe to share between them
+        self.netease_lock = threading.Lock()
 
     def get_lyrics(self, artist, title, provider=None):
         query = f"{title} {artist}"
         if query == self.current_query and query in self.lyrics_cache:
             return self.lyrics_cache[query]
-        
-        print(f"Fetching lyrics for: {query} (Provider: {provider})")
-        
-        providers = None
-        if provider and provider != "Auto":
-            providers = [provider]
-            
-        try:
-            if providers:
-                lrc_str = syncedlyrics.search(query, providers=providers)
+
+        log.info("Fetching lyrics for: %s (Provider: %s)", query, provider)
+
+        variants = None
+        if provider in ("NetEase", "Auto", None):
+            # NetEase is the source that has translations/romanizations, so
+            # Auto tries it first and only falls back to the others without it
+            try:
+                variants = self.fetch_netease(query)
+            except Exception as e:
+                log.warning("Error fetching from provider NetEase: %s", e)
+
+        original = self.parse_lrc(variants.get('lrc')) if variants else []
+        if not original and provider != "NetEase":
+            if provider and provider != "Auto":
+                providers = [provider]
             else:
-                lrc_str = syncedlyrics.search(query)
-        except Exception as e:
-            print(f"Error fetching from provider {providers}: {e}")
-            lrc_str = None
-        
-        if lrc_str:
+                providers = AUTO_FALLBACK_PROVIDERS
+            try:
+                variants = {'lrc': syncedlyrics.search(query, providers=providers)}
+            except Exception as e:
+                log.warning("Error fetching from provider %s: %s", providers, e)
+                variants = None
+            original = self.parse_lrc(variants.get('lrc')) if variants else []
+
+        if original:
             self.current_query = query
-            self.lyrics_cache[query] = self.parse_lrc(lrc_str)
+            self.lyrics_cache[query] = self.merge_timelines(
+                original,
+                self.parse_lrc(variants.get('translation')),
+                self.parse_lrc(variants.get('romanization'))
+            )
             return self.lyrics_cache[query]
         return None
 
+    def fetch_netease(self, query):
+        # Same two requests syncedlyrics makes, but the lyric request asks for
+        # the translated (tv) and romanized (rv) versions in the same response.
+        with self.netease_lock:
+            if self.netease is None:
+                self.netease = NetEase()
+
+            track = self.netease.search_track(query)
+            if not track:
+                return None
+
+            params = {"id": track["id"], "lv": 1, "tv": -1, "rv": -1}
+            data = self.netease.session.get(NetEase.API_ENDPOINT_LYRICS, params=params).json()
+        return {
+            'lrc': (data.get("lrc") or {}).get("lyric"),
+            'translation': (data.get("tlyric") or {}).get("lyric"),
+            'romanization': (data.get("romalrc") or {}).get("lyric")
+        }
+
     def parse_lrc(self, lrc_str):
         if not lrc_str:
             return []
-        
+
         lines = []
         # Regex for [mm:ss.xx] or [mm:ss.xxx]
         pattern = re.compile(r'\[(\d+):(\d+(?:\.\d+)?)\](.*)')
-        
+
         for line in lrc_str.splitlines():
             match = pattern.match(line)
             if match:
@@ -49,15 +101,49 @@ class LyricsFetcher:
                 total_seconds = minutes * 60 + seconds
                 if text: # Skip empty lines? Or keep them to clear text?
                     lines.append((total_seconds, text))
-        
-        # Sort by time just in case
+
+        # Sort by time just in case (stable, so same-timestamp lines keep file order)
         lines.sort(key=lambda x: x[0])
         return lines
 
+    def merge_timelines(self, original, translation=None, romanization=None):
+        """Attaches secondary lines to the nearest original line within MERGE_TOLERANCE.
+
+        Some providers embed the translation as a second line with the same
+        timestamp instead of a separate LRC; those are folded in as well.
+        """
+        merged = []
+        embedded = []
+        for t, text in original:
+            if merged and merged[-1][0] == t:
+                embedded.append((t, text))
+            else:
+                merged.append([t, text, "", ""])
+
+        times = [line[0] for line in merged]
+
+        def attach(secondary, slot):
+            for t, text in secondary:
+                i = bisect.bisect_left(times, t)
+                # Closest of the neighbours on either side
+                nearest = min(
+                    (j for j in (i - 1, i) if 0 <= j < len(times)),
+                    key=lambda j: abs(times[j] - t),
+                    default=None
+                )
+                if nearest is not None and abs(times[nearest] - t) <= MERGE_TOLERANCE and not merged[nearest][slot]:
+                    merged[nearest][slot] = text
+
+        attach(translation or [], 2)
+        attach(embedded, 2)
+        attach(romanization or [], 3)
+
+        return [LyricLine(*line) for line in merged]
+
 if __name__ == "__main__":
     fetcher = LyricsFetcher()
     # Test with a known song
     lyrics = fetcher.get_lyrics("Rick Astley", "Never Gonna Give You Up")
     if lyrics:
-        for t, text in lyrics[:5]:
-            print(f"{t}: {text}")
+        for line in lyrics[:5]:
+            print(f"{line.time}: {line.text} | {line.translation} | {line.romanization}")
@@ -1,5 +1,6 @@
 import sys
 import asyncio
+import logging
 import time
 import threading # Still needed for sync lyrics fetching maybe? Or make it async.
 from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu
@@ -7,10 +8,23 @@ from PyQt6.QtGui import QIcon, QAction
 from qasync import QEventLoop, asyncSlot
 
 from overlay_ui import OverlayWindow
-from media_monitor import MediaMonitor
+from media_monitor import MediaMonitor, PLAYING
 from lyrics_fetcher import LyricsFetcher
 from config_manager import ConfigManager
 from settings_ui import SettingsWindow
+from log_manager import LogManager
+from push_server import PushServer
+
+log = logging.getLogger(__name__)
+
+# Republish when the position drifts this far (seconds) from the one last pushed
+PUSH_SEEK_THRESHOLD = 1.0
+
+# "secondary_lyric" config value -> LyricLine field
+SECONDARY_FIELDS = {
+    "Translation": "translation",
+    "Romanization": "romanization"
+}
 
 class DesktopLyricApp:
     def __init__(self):
@@ -21,8 +35,15 @@ class DesktopLyricApp:
         asyncio.set_event_loop(self.loop)
 
         self.config_manager = ConfigManager()
+        self.log_manager = LogManager()
+        self.log_manager.setup(
+            level=self.config_manager.get("log_level"),
+            log_file=self.config_manager.get("log_file")
+        )
         self.ui = OverlayWindow(self.config_manager)
         self.fetcher = LyricsFetcher()
+        self.monitor = MediaMonitor(**self.session_rules())
+        self.config_manager.add_listener(self.on_config_changed)
         
         self.current_lyrics = []
         self.current_song_key = None # (title, artist)
@@ -30,12 +51,28 @@ class DesktopLyricApp:
         self.info_timestamp = 0
         self.last_monotonic_pos = 0 # Track last position to prevent jitter backwards
 
+        # Optional local push API (OBS browser source, second screen...)
+        self.push_server = None
+        self.last_push_key = None
+        self.last_push_position = 0
+        self.last_push_time = 0
+        if self.config_manager.get("push_server_enabled"):
+            self.push_server = PushServer(
+                self.config_manager.get("push_server_host"),
+                self.config_manager.get("push_server_port")
+            )
+
         # System Tray
         self.setup_tray()
 
         self.ui.show()
+        self.app.aboutToQuit.connect(self.monitor.close)
+        self.app.aboutToQuit.connect(self.log_manager.shutdown)
+        self.app.aboutToQuit.connect(self.stop_push_server)
 
         # Start background tasks
+        if self.push_server:
+            self.loop.create_task(self.start_push_server())
         self.loop.create_task(self.run_monitor())
         self.loop.create_task(self.update_loop())
 
@@ -75,25 +112,45 @@ class DesktopLyricApp:
             self.open_settings()
 
     def open_settings(self):
-        self.settings_window = SettingsWindow(None, self.config_manager)
-        self.settings_window.show()
+        SettingsWindow.present(self.config_manager)
+
+    def session_rules(self):
+        return {
+            'pinned_app': self.config_manager.get("pinned_app"),
+            'prefer_playing': self.config_manager.get("prefer_playing"),
+            'blocked_apps': self.config_manager.get("blocked_apps"),
+        }
+
+    def on_config_changed(self):
+        self.monitor.set_priority_rules(**self.session_rules())
+        self.log_manager.set_level(self.config_manager.get("log_level"))
 
     async def run_monitor(self):
-        monitor = MediaMonitor()
-        await monitor.initialize()
+        await self.monitor.initialize()
         while True:
             try:
-                info = await monitor.get_media_info()
+                info = await self.monitor.get_media_info()
                 if info:
                     self.last_info = info
                     # Fallback timestamp if last_updated is missing
                     if not info.get('last_updated'):
                         self.info_timestamp = time.time()
             except Exception as e:
-                print(f"Monitor error: {e}")
+                log.error("Monitor error: %s", e)
             
             await asyncio.sleep(0.1) # Check more frequently
 
+    async def start_push_server(self):
+        try:
+            await self.push_server.start()
+        except OSError as e:
+            log.error("Could not start push server: %s", e)
+            self.push_server = None
+
+    def stop_push_server(self):
+        if self.push_server:
+            self.push_server.close()
+
     async def update_loop(self):
         while True:
             self.update_ui()
@@ -169,16 +226,26 @@ class DesktopLyricApp:
                 self.last_monotonic_pos = current_pos
 
             # Find lyric line
+            # Translation/romanization were merged in at fetch time, so the
+            # secondary line comes from the same entry
             current_line = ""
+            secondary_line = ""
+            line_time = None
+            next_lyric = None
+            secondary_field = SECONDARY_FIELDS.get(self.config_manager.get("secondary_lyric"))
             if self.current_lyrics:
-                for t, text in self.current_lyrics:
-                    if t <= current_pos:
-                        current_line = text
+                for line in self.current_lyrics:
+                    if line.time <= current_pos:
+                        current_line = line.text
+                        secondary_line = getattr(line, secondary_field) if secondary_field else ""
+                        line_time = line.time
                     else:
+                        next_lyric = line
                         break
             
-            # Debug position and line
-            # print(f"Pos: {current_pos:.2f}, Line: {current_line}")
+            # Debug position and line (guarded so the tick loop pays one check when disabled)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Pos: %.2f, Line: %s", current_pos, current_line)
 
             # Fallback to Title - Artist if no lyrics found
             if not current_line:
@@ -195,10 +262,50 @@ class DesktopLyricApp:
                      current_line = f"{title} - {artist}"
             
             if current_line:
-                self.ui.update_text(current_line)
+                self.ui.update_text(current_line, secondary_line)
+
+            self.publish_state(info, current_pos, line_time, current_line, secondary_line, next_lyric)
 
         else:
             self.ui.update_text("Waiting for music...")
+            self.publish_state(None, 0, None, "", "", None)
+
+    def publish_state(self, info, position, line_time, line, secondary_line, next_lyric):
+        # Only line, song, play/pause and seek changes are pushed; ticks in
+        # between cost a tuple compare and a position check
+        if not self.push_server:
+            return
+        status = info.get('status') if info else None
+        now = time.time()
+        key = (self.current_song_key, line_time, line, secondary_line, status)
+        if key == self.last_push_key:
+            # Same line, but a seek within it moves the position and deadline
+            predicted = self.last_push_position
+            if status == PLAYING:
+                predicted += now - self.last_push_time
+            if abs(position - predicted) <= PUSH_SEEK_THRESHOLD:
+                return
+        self.last_push_key = key
+        self.last_push_position = position
+        self.last_push_time = now
+
+        deadline = None
+        if next_lyric and status == PLAYING:
+            # Wall-clock time at which the next line is due
+            deadline = now + (next_lyric.time - position)
+
+        self.push_server.publish({
+            'title': info.get('title') if info else None,
+            'artist': info.get('artist') if info else None,
+            'app_id': info.get('app_id') if info else None,
+            'playing': status == PLAYING,
+            'position': position,
+            'duration': info.get('duration') if info else 0,
+            'line': line,
+            'secondary_line': secondary_line,
+            'next_line': next_lyric.text if next_lyric else None,
+            'line_deadline': deadline
+        })
 
     def fetch_lyrics_sync(self, artist, title, provider):
         try:
@@ -207,9 +314,9 @@ class DesktopLyricApp:
                 self.current_lyrics = lyrics
             else:
                 self.current_lyrics = []
-                print(f"No lyrics found for {title}")
+                log.info("No lyrics found for %s", title)
         except Exception as e:
-            print(f"Fetch error: {e}")
+            log.error("Fetch error: %s", e)
 
     def run(self):
         with self.loop:
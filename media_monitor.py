@@ -1,47 +1,214 @@
 import asyncio
+import logging
 from winsdk.windows.media.control import GlobalSystemMediaTransportControlsSessionManager
 
+log = logging.getLogger(__name__)
+
+# GlobalSystemMediaTransportControlsSessionPlaybackStatus.Playing
+PLAYING = 4
+
 class MediaMonitor:
-    def __init__(self):
+    def __init__(self, pinned_app="", prefer_playing=True, blocked_apps=None):
         self.manager = None
         self.current_session = None
+        self.current_entry = None
+
+        # Session table, one entry per session (an app can own several):
+        # {'app_id', 'session', 'status', 'token', 'events'}
+        # 'status' is None when a playback_info_changed event marked it stale.
+        self.sessions = []
+        self.manager_tokens = []
+
+        # WinRT events only flip these flags; the actual work happens on the
+        # next poll so steady-state polls do no per-session calls at all.
+        self.sessions_dirty = True
+        self.rank_dirty = True
+
+        self.set_priority_rules(pinned_app, prefer_playing, blocked_apps)
 
     async def initialize(self):
         self.manager = await GlobalSystemMediaTransportControlsSessionManager.request_async()
+        self.sessions_dirty = True
+        try:
+            self.manager_tokens = [
+                ('sessions', self.manager.add_sessions_changed(self.on_sessions_changed)),
+                ('current', self.manager.add_current_session_changed(self.on_current_session_changed)),
+            ]
+        except Exception:
+            # No change notifications: fall back to rescanning on every poll
+            self.manager_tokens = []
+
+    def set_priority_rules(self, pinned_app="", prefer_playing=True, blocked_apps=None):
+        # App ids are matched case-insensitively by substring, so "spotify"
+        # matches "Spotify.exe" and "msedge" matches "MSEdge".
+        self.pinned_app = (pinned_app or "").lower()
+        self.prefer_playing = prefer_playing
+        self.blocked_apps = [app.lower() for app in (blocked_apps or []) if app]
+        self.rank_dirty = True
+
+    def matches(self, app_id, pattern):
+        return pattern in (app_id or "").lower()
+
+    def is_blocked(self, app_id):
+        return any(self.matches(app_id, pattern) for pattern in self.blocked_apps)
+
+    # WinRT event handlers (called from a WinRT worker thread)
+    def on_sessions_changed(self, sender, args):
+        self.sessions_dirty = True
+
+    def on_current_session_changed(self, sender, args):
+        self.rank_dirty = True
+
+    def on_playback_info_changed(self, entry):
+        entry['events'] += 1
+        entry['status'] = None
+        self.rank_dirty = True
+
+    def read_status(self, session):
+        try:
+            info = session.get_playback_info()
+            return info.playback_status if info else None
+        except Exception:
+            return None
+
+    def refresh_status(self, entry):
+        events = entry['events']
+        status = self.read_status(entry['session'])
+        # An event during the read means the value may already be stale;
+        # leave it marked stale (rank_dirty is set again by the handler)
+        entry['status'] = status if entry['events'] == events else None
+
+    def sync_sessions(self):
+        # Session wrappers can't be matched across get_sessions() calls, so the
+        # table is rebuilt with fresh registrations. This only runs when the
+        # set of sessions changes, not on steady-state polls.
+        # Flags are cleared before the WinRT calls so an event that fires on
+        # the worker thread meanwhile sets them again instead of being lost.
+        self.sessions_dirty = False
+        self.rank_dirty = True
+        sessions = self.manager.get_sessions() or []
+        previous = self.current_entry
+        self.clear_sessions()
+
+        for session in sessions:
+            try:
+                app_id = session.source_app_user_model_id
+            except Exception:
+                continue
+
+            entry = {'app_id': app_id, 'session': session, 'status': None, 'token': None, 'events': 0}
+            try:
+                entry['token'] = session.add_playback_info_changed(
+                    lambda sender, args, entry=entry: self.on_playback_info_changed(entry)
+                )
+            except Exception:
+                pass
+            self.refresh_status(entry)
+            self.sessions.append(entry)
+
+        # Keep showing the same app if it still has a session
+        if previous:
+            self.current_entry = next(
+                (entry for entry in self.sessions if entry['app_id'] == previous['app_id']), None
+            )
+
+        # Without event registration we cannot trust the table between polls
+        if not self.manager_tokens:
+            self.sessions_dirty = True
+
+    def clear_sessions(self):
+        for entry in self.sessions:
+            if entry['token'] is not None:
+                try:
+                    entry['session'].remove_playback_info_changed(entry['token'])
+                except Exception:
+                    pass
+        self.sessions = []
+        self.current_entry = None
+        self.current_session = None
+
+    def rank_sessions(self):
+        # Cleared first, like sessions_dirty in sync_sessions
+        self.rank_dirty = False
+        for entry in self.sessions:
+            if entry['status'] is None or entry['token'] is None:
+                self.refresh_status(entry)
+
+        # Sessions we can't get events for have to be re-checked every poll
+        if any(entry['token'] is None for entry in self.sessions):
+            self.rank_dirty = True
+
+        candidates = [entry for entry in self.sessions if not self.is_blocked(entry['app_id'])]
+        self.current_entry = self.pick_session(candidates)
+        self.current_session = self.current_entry['session'] if self.current_entry else None
+
+    def pick_session(self, candidates):
+        # Priority:
+        # 1. The pinned app, if it has a session
+        # 2. A session that is currently Playing (the current one wins ties,
+        #    so two players running at once don't flip-flop)
+        # 3. The system's "Current" session (which might be paused but focused)
+        # 4. Whatever we showed last, then any remaining session
+        if self.pinned_app:
+            pinned = [entry for entry in candidates if self.matches(entry['app_id'], self.pinned_app)]
+            if pinned:
+                playing = [entry for entry in pinned if entry['status'] == PLAYING]
+                return (playing or pinned)[0]
+
+        if self.prefer_playing:
+            playing = [entry for entry in candidates if entry['status'] == PLAYING]
+            if playing:
+                return self.current_entry if self.is_candidate(self.current_entry, playing) else playing[0]
+
+        try:
+            system_session = self.manager.get_current_session()
+            system_app_id = system_session.source_app_user_model_id if system_session else None
+        except Exception:
+            system_app_id = None
+        if system_app_id:
+            if self.is_candidate(self.current_entry, candidates) and self.current_entry['app_id'] == system_app_id:
+                return self.current_entry
+            for entry in candidates:
+                if entry['app_id'] == system_app_id:
+                    return entry
+
+        if self.is_candidate(self.current_entry, candidates):
+            return self.current_entry
+        return candidates[0] if candidates else None
+
+    def is_candidate(self, entry, candidates):
+        # Identity, not ==: two entries of one app can compare equal as dicts
+        return any(candidate is entry for candidate in candidates)
 
     def update_session(self):
         if not self.manager:
             return None
-        
-        # Priority:
-        # 1. Any session that is currently Playing (4)
-        # 2. The system's "Current" session (which might be paused but focused)
-        
-        sessions = self.manager.get_sessions()
-        playing_session = None
-        
-        if sessions:
-            for session in sessions:
+
+        if self.sessions_dirty:
+            self.sync_sessions()
+        if self.rank_dirty:
+            self.rank_sessions()
+
+        return self.current_session
+
+    def close(self):
+        self.clear_sessions()
+        if self.manager:
+            for name, token in self.manager_tokens:
                 try:
-                    info = session.get_playback_info()
-                    # 4 = GlobalSystemMediaTransportControlsSessionPlaybackStatus.Playing
-                    if info and info.playback_status == 4:
-                        playing_session = session
-                        break
+                    if name == 'sessions':
+                        self.manager.remove_sessions_changed(token)
+                    else:
+                        self.manager.remove_current_session_changed(token)
                 except Exception:
-                    continue
-        
-        if playing_session:
-            self.current_session = playing_session
-        else:
-            self.current_session = self.manager.get_current_session()
-            
-        return self.current_session
+                    pass
+        self.manager_tokens = []
+        self.sessions_dirty = True
 
     async def get_media_info(self):
         if not self.manager:
             await self.initialize()
-        
+
         session = self.update_session()
         if not session:
             return None
@@ -50,7 +217,14 @@ class MediaMonitor:
             props = await session.try_get_media_properties_async()
             timeline = session.get_timeline_properties()
             playback_info = session.get_playback_info()
-            
+            app_id = session.source_app_user_model_id
+
+            # Self-heal if a status change event was missed
+            entry = self.current_entry
+            if entry and entry['status'] is not None and entry['status'] != playback_info.playback_status:
+                entry['status'] = playback_info.playback_status
+                self.rank_dirty = True
+
             return {
                 'artist': props.artist,
                 'title': props.title,
@@ -59,10 +233,12 @@ class MediaMonitor:
                 'duration': timeline.end_time.total_seconds() if timeline else 0,
                 'last_updated': timeline.last_updated_time.timestamp() if timeline and timeline.last_updated_time else 0,
                 'status': playback_info.playback_status, # 4=Playing, 5=Paused
-                'app_id': session.source_app_user_model_id
+                'app_id': app_id
             }
         except Exception as e:
-            print(f"Error getting media info: {e}")
+            log.warning("Error getting media info: %s", e)
+            # The session may have gone away; rescan on the next poll
+            self.sessions_dirty = True
             return None
 
 if __name__ == "__main__":
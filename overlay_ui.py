@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QMainWindow, QLabel, QMenu, QApplication, QGraphicsOpacityEffect
+from PyQt6.QtWidgets import QMainWindow, QLabel, QMenu, QApplication, QGraphicsOpacityEffect, QWidget, QVBoxLayout
 from PyQt6.QtCore import Qt, QPoint, QPropertyAnimation, QEasingCurve, QRect
 from PyQt6.QtGui import QFont, QColor, QAction, QPainter, QPainterPath, QPen
 from settings_ui import SettingsWindow
@@ -12,6 +12,10 @@ class OutlinedLabel(QLabel):
         self.outline_width = 4
         self.setContentsMargins(0, 0, 0, 0)
 
+        # The text path only changes with text, font or size, not every repaint
+        self.cached_path = None
+        self.cached_key = None
+
     def set_colors(self, text_color_hex):
         self.text_color = QColor(text_color_hex)
         # Determine outline color based on brightness? Or just default to black/semi-transparent black
@@ -22,13 +26,30 @@ class OutlinedLabel(QLabel):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        path = QPainterPath()
+        path = self.text_path()
+
+        # Draw outline
+        pen = QPen(self.outline_color, self.outline_width, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPath(path)
+
+        # Draw text
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.text_color)
+        painter.drawPath(path)
+
+    def text_path(self):
         font = self.font()
-        
-        # Center text
         rect = self.rect()
         text = self.text()
-        
+
+        key = (text, font.key(), rect.width(), rect.height())
+        if key == self.cached_key:
+            return self.cached_path
+
+        path = QPainterPath()
+
         # Calculate text position to center it
         fm = self.fontMetrics()
         text_width = fm.horizontalAdvance(text)
@@ -45,16 +66,9 @@ class OutlinedLabel(QLabel):
 
         path.addText(x, y, font, text)
 
-        # Draw outline
-        pen = QPen(self.outline_color, self.outline_width, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
-        painter.setPen(pen)
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawPath(path)
-
-        # Draw text
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(self.text_color)
-        painter.drawPath(path)
+        self.cached_key = key
+        self.cached_path = path
+        return path
 
 class OverlayWindow(QMainWindow):
     def __init__(self, config_manager):
@@ -72,10 +86,22 @@ class OverlayWindow(QMainWindow):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         # self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, False) # Controlled by config
 
-        # Label
-        self.label = OutlinedLabel("Waiting for music...", self)
+        # Labels: main lyric line and an optional translation/romanization line below it
+        container = QWidget(self)
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        self.label = OutlinedLabel("Waiting for music...", container)
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.setCentralWidget(self.label)
+        layout.addWidget(self.label, 3)
+
+        self.secondary_label = OutlinedLabel("", container)
+        self.secondary_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.secondary_label.hide()
+        layout.addWidget(self.secondary_label, 2)
+
+        self.setCentralWidget(container)
         
         # Animation Effect - Removed for stability
         # self.opacity_effect = QGraphicsOpacityEffect(self.label)
@@ -125,9 +151,14 @@ class OverlayWindow(QMainWindow):
         font = QFont(family, size)
         font.setBold(True)
         self.label.setFont(font)
+
+        secondary_font = QFont(family, max(8, round(size * 0.6)))
+        secondary_font.setBold(True)
+        self.secondary_label.setFont(secondary_font)
         
         # Color
         self.label.set_colors(self.config_manager.get("text_color"))
+        self.secondary_label.set_colors(self.config_manager.get("text_color"))
         
         # Click Through
         self.set_click_through(self.config_manager.get("click_through"))
@@ -140,12 +171,18 @@ class OverlayWindow(QMainWindow):
     def on_config_changed(self):
         self.apply_config()
 
-    def update_text(self, text):
+    def update_text(self, text, secondary=""):
         if text:
             text = text.strip()
         if self.label.text() != text:
             self.label.setText(text)
             self.label.update() # Force repaint
+
+        secondary = secondary.strip() if secondary else ""
+        if self.secondary_label.text() != secondary:
+            self.secondary_label.setText(secondary)
+            self.secondary_label.setVisible(bool(secondary))
+            self.secondary_label.update()
             
     # def animate_text_change(self, new_text): ...
 
@@ -192,8 +229,7 @@ class OverlayWindow(QMainWindow):
         menu.exec(pos)
 
     def open_settings(self):
-        self.settings_window = SettingsWindow(self, self.config_manager)
-        self.settings_window.show()
+        SettingsWindow.present(self.config_manager)
 
     def closeEvent(self, event):
         # Ensure clean exit if needed
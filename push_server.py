@@ -0,0 +1,310 @@
+import asyncio
+import base64
+import collections
+import hashlib
+import json
+import logging
+import os
+import struct
+import time
+
+log = logging.getLogger(__name__)
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11E3F"
+
+# WebSocket opcodes
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+# Clients never need to send us more than a close/ping
+MAX_CLIENT_FRAME = 64 * 1024
+
+def encode_frame(payload, opcode=OP_TEXT, mask=False):
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 65536:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+
+    if mask:
+        key = os.urandom(4)
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        header += key
+    return bytes(header) + payload
+
+async def read_frame(reader, max_size=None):
+    """Returns (opcode, payload) for one (unfragmented) frame."""
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if max_size is not None and length > max_size:
+        raise ValueError(f"Frame too large: {length} bytes")
+
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if key:
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+async def read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+class PushClient:
+    """One subscriber. Holds at most `queue_size` undelivered events; when a
+    slow client falls behind, the oldest events are dropped so it always
+    catches up to the newest state instead of stalling the publisher."""
+
+    def __init__(self, server, writer, kind, queue_size):
+        self.server = server
+        self.writer = writer
+        self.kind = kind # 'ws' or 'sse'
+        self.queue = collections.deque(maxlen=queue_size)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, event, replay=False):
+        # Replays of the last state to a new subscriber aren't counted as
+        # deliveries; their age is time since publish, not delivery latency
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append((event, replay))
+        self.ready.set()
+
+    async def run(self):
+        try:
+            while not self.closed:
+                await self.ready.wait()
+                self.ready.clear()
+                while self.queue:
+                    event, replay = self.queue.popleft()
+                    self.writer.write(event.encoded(self.kind))
+                    await self.writer.drain()
+                    if not replay:
+                        self.server.record_latency(time.perf_counter() - event.published)
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.ready.set()
+        self.server.clients.discard(self)
+        self.writer.close()
+
+class PushEvent:
+    """A published state, serialized once and framed at most once per transport."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.published = time.perf_counter()
+        self.frames = {}
+
+    def encoded(self, kind):
+        frame = self.frames.get(kind)
+        if frame is None:
+            if kind == 'ws':
+                frame = encode_frame(self.payload)
+            else:
+                frame = b"data: " + self.payload + b"\n\n"
+            self.frames[kind] = frame
+        return frame
+
+class PushServer:
+    """Local HTTP/WebSocket server that pushes lyric state changes.
+
+    GET /ws      WebSocket, one JSON text message per state change
+    GET /events  Server-Sent Events, same payloads
+    GET /state   Latest state as JSON
+    GET /stats   Subscriber count and delivery latency
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, queue_size=8):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.server = None
+        self.clients = set()
+        self.seq = 0
+        self.last_event = None
+
+        self.delivered = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_last = 0.0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        log.info("Push server listening on http://%s:%d", self.host, self.port)
+
+    def close(self):
+        # Synchronous so it can run from aboutToQuit, after which the loop stops
+        for client in list(self.clients):
+            client.close()
+        if self.server:
+            self.server.close()
+
+    async def stop(self):
+        self.close()
+        if self.server:
+            await self.server.wait_closed()
+            self.server = None
+
+    def publish(self, state):
+        # Must be called from the event loop thread
+        self.seq += 1
+        event = dict(state, seq=self.seq, sent_at=time.time())
+        self.last_event = PushEvent(json.dumps(event, ensure_ascii=False).encode("utf-8"))
+        for client in self.clients:
+            client.push(self.last_event)
+
+    def record_latency(self, latency):
+        self.delivered += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_last = latency
+
+    def stats(self):
+        return {
+            'clients': len(self.clients),
+            'published': self.seq,
+            'delivered': self.delivered,
+            'dropped': sum(client.dropped for client in self.clients),
+            'latency_last_ms': self.latency_last * 1000,
+            'latency_avg_ms': (self.latency_total / self.delivered * 1000) if self.delivered else 0,
+            'latency_max_ms': self.latency_max * 1000
+        }
+
+    async def handle_connection(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            headers = await read_headers(reader)
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+            return
+
+        path = path.split("?", 1)[0]
+        if method != "GET":
+            self.respond(writer, "405 Method Not Allowed", b"")
+        elif path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+            await self.serve_websocket(reader, writer, headers)
+        elif path == "/events":
+            await self.serve_events(writer)
+        elif path == "/state":
+            self.respond(writer, "200 OK", self.last_event.payload if self.last_event else b"{}")
+        elif path == "/stats":
+            self.respond(writer, "200 OK", json.dumps(self.stats()).encode("utf-8"))
+        else:
+            self.respond(writer, "404 Not Found", b"")
+
+    def respond(self, writer, status, body):
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        writer.close()
+
+    def subscribe(self, writer, kind):
+        client = PushClient(self, writer, kind, self.queue_size)
+        self.clients.add(client)
+        # New subscribers start from the current state
+        if self.last_event:
+            client.push(self.last_event, replay=True)
+        return client
+
+    async def serve_events(self, writer):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream; charset=utf-8\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Access-Control-Allow-Origin: *\r\n\r\n"
+        )
+        await self.subscribe(writer, 'sse').run()
+
+    async def serve_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            self.respond(writer, "400 Bad Request", b"")
+            return
+
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode("ascii")
+        )
+
+        client = self.subscribe(writer, 'ws')
+        sender = asyncio.ensure_future(client.run())
+        try:
+            # Only control frames are expected from subscribers
+            while not client.closed:
+                opcode, payload = await read_frame(reader, MAX_CLIENT_FRAME)
+                if opcode == OP_CLOSE:
+                    writer.write(encode_frame(payload[:2], OP_CLOSE))
+                    break
+                if opcode == OP_PING:
+                    writer.write(encode_frame(payload, OP_PONG))
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            client.close()
+            await sender
+
+if __name__ == "__main__":
+    import sys
+
+    async def main(host, port):
+        # Minimal subscriber: prints each event and how long it took to arrive
+        reader, writer = await asyncio.open_connection(host, port)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        writer.write(
+            f"GET /ws HTTP/1.1\r\nHost: {host}:{port}\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode("ascii")
+        )
+        status = await reader.readline()
+        await read_headers(reader)
+        if b" 101 " not in status:
+            print(f"Handshake failed: {status.decode().strip()}")
+            return
+
+        while True:
+            opcode, payload = await read_frame(reader)
+            if opcode == OP_CLOSE:
+                break
+            if opcode != OP_TEXT:
+                continue
+            event = json.loads(payload)
+            latency = (time.time() - event['sent_at']) * 1000
+            print(f"#{event['seq']} {latency:.2f} ms  {event.get('line')!r} -> {event.get('next_line')!r}")
+
+    host = sys.argv[1] if len(sys.argv) > 1 else "127.0.0.1"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    asyncio.run(main(host, port))
@@ -1,19 +1,78 @@
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QFormLayout, QFontComboBox, 
+    QDialog, QVBoxLayout, QFormLayout, QStyledItemDelegate,
     QSpinBox, QPushButton, QColorDialog, QCheckBox, 
-    QLabel, QHBoxLayout, QComboBox, QMessageBox
+    QLabel, QHBoxLayout, QComboBox, QMessageBox, QApplication
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontDatabase
+
+# Families added to the font list per event loop turn
+FONT_BATCH_SIZE = 40
+
+class FontPreviewDelegate(QStyledItemDelegate):
+    """Draws each family in its own font, creating the QFont only when the row is painted."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.fonts = {}
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        family = index.data()
+        font = self.fonts.get(family)
+        if font is None:
+            font = QFont(option.font)
+            font.setFamily(family)
+            self.fonts[family] = font
+        option.font = font
+
+class FontFamilyLoader(QThread):
+    """Enumerates installed font families off the GUI thread.
+
+    QFontDatabase.families() scans every installed font on first use, which
+    takes seconds with large CJK font sets. QFontDatabase is thread-safe, so
+    the scan runs here and only the result is handed back to the GUI thread.
+    """
+    loaded = pyqtSignal(list)
+
+    def run(self):
+        # Skip vertical (@-prefixed) and private system families, like QFontComboBox does
+        families = [
+            family for family in QFontDatabase.families()
+            if not family.startswith("@") and not QFontDatabase.isPrivateFamily(family)
+        ]
+        self.loaded.emit(families)
 
 class SettingsWindow(QDialog):
+    # Shared by the tray icon and the overlay's context menu
+    instance = None
+
+    @classmethod
+    def get_instance(cls, config_manager):
+        if cls.instance is None:
+            cls.instance = cls(None, config_manager)
+        return cls.instance
+
+    @classmethod
+    def present(cls, config_manager):
+        window = cls.get_instance(config_manager)
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        return window
+
     def __init__(self, parent, config_manager):
         super().__init__(parent)
         self.config_manager = config_manager
         self.setWindowTitle("Settings")
-        self.setFixedSize(400, 450) # Increased height
+        self.setFixedSize(400, 480) # Increased height
         self.setWindowFlags(Qt.WindowType.Dialog | Qt.WindowType.WindowStaysOnTopHint)
 
+        self.pending_families = None # None until the font list has been requested
+        self.font_loader = None
+        # Qt aborts if a running QThread is destroyed, e.g. quitting mid-scan
+        QApplication.instance().aboutToQuit.connect(self.wait_for_font_loader)
+
         self.setup_ui()
 
     def setup_ui(self):
@@ -21,10 +80,16 @@ class SettingsWindow(QDialog):
         form_layout = QFormLayout()
 
         # Font Family
-        self.font_combo = QFontComboBox()
-        current_font = self.config_manager.get("font_family")
-        self.font_combo.setCurrentFont(QFont(current_font))
-        self.font_combo.currentFontChanged.connect(self.on_font_change)
+        # Only the current family is added up front; the rest are filled in
+        # after the window is shown (see load_font_families).
+        self.font_combo = QComboBox()
+        self.font_combo.setItemDelegate(FontPreviewDelegate(self.font_combo))
+        self.font_combo.view().setUniformItemSizes(True)
+        self.font_combo.setMaxVisibleItems(15)
+        self.font_combo.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        self.font_combo.setMinimumContentsLength(20)
+        self.font_combo.addItem(self.config_manager.get("font_family"))
+        self.font_combo.currentTextChanged.connect(self.on_font_change)
         form_layout.addRow("Font Family:", self.font_combo)
 
         # Font Size
@@ -52,6 +117,16 @@ class SettingsWindow(QDialog):
         self.provider_combo.currentTextChanged.connect(self.on_provider_change)
         form_layout.addRow("Lyrics Source:", self.provider_combo)
 
+        # Secondary line (translation/romanization, when the provider has one)
+        self.secondary_combo = QComboBox()
+        self.secondary_combo.addItems(["None", "Translation", "Romanization"])
+        index = self.secondary_combo.findText(self.config_manager.get("secondary_lyric"))
+        if index >= 0:
+            self.secondary_combo.setCurrentIndex(index)
+        self.secondary_combo.currentTextChanged.connect(self.on_secondary_change)
+        self.secondary_combo.setToolTip("Translations and romanizations come from NetEase (the \"Auto\" or \"NetEase\" source).")
+        form_layout.addRow("Second Line:", self.secondary_combo)
+
         # Alignment
         self.align_combo = QComboBox()
         alignments = ["Custom", "Top Center", "Bottom Center", "Center"]
@@ -98,8 +173,78 @@ class SettingsWindow(QDialog):
 
         self.setLayout(layout)
 
-    def on_font_change(self, font):
-        self.config_manager.set("font_family", font.family())
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.sync_from_config()
+        if self.pending_families is None:
+            self.pending_families = []
+            self.load_font_families()
+
+    def sync_from_config(self):
+        # Config may have changed while hidden (e.g. dragging resets alignment)
+        widgets = [
+            self.font_combo, self.size_spin, self.provider_combo, self.secondary_combo, self.align_combo,
+            self.height_spin, self.lock_check, self.click_through_check
+        ]
+        for widget in widgets:
+            widget.blockSignals(True)
+
+        family = self.config_manager.get("font_family")
+        index = self.font_combo.findText(family)
+        if index < 0:
+            self.font_combo.addItem(family)
+            index = self.font_combo.count() - 1
+        self.font_combo.setCurrentIndex(index)
+        self.size_spin.setValue(self.config_manager.get("font_size"))
+        combos = (
+            (self.provider_combo, "provider"),
+            (self.secondary_combo, "secondary_lyric"),
+            (self.align_combo, "alignment")
+        )
+        for combo, key in combos:
+            index = combo.findText(self.config_manager.get(key))
+            if index >= 0:
+                combo.setCurrentIndex(index)
+        self.height_spin.setValue(self.config_manager.get("window_height"))
+        self.lock_check.setChecked(self.config_manager.get("locked"))
+        self.click_through_check.setChecked(self.config_manager.get("click_through"))
+
+        for widget in widgets:
+            widget.blockSignals(False)
+        self.update_color_btn_style()
+
+    def load_font_families(self):
+        self.font_loader = FontFamilyLoader(self)
+        self.font_loader.loaded.connect(self.on_font_families_loaded)
+        self.font_loader.finished.connect(self.font_loader.deleteLater)
+        self.font_loader.start()
+
+    def wait_for_font_loader(self):
+        if self.font_loader is not None:
+            self.font_loader.wait()
+
+    def on_font_families_loaded(self, families):
+        # Delivered on the GUI thread (queued connection)
+        self.font_loader = None
+        present = {self.font_combo.itemText(i) for i in range(self.font_combo.count())}
+        self.pending_families = [family for family in families if family not in present]
+        self.add_font_batch()
+
+    def add_font_batch(self):
+        batch = self.pending_families[:FONT_BATCH_SIZE]
+        del self.pending_families[:FONT_BATCH_SIZE]
+        self.font_combo.addItems(batch)
+
+        if self.pending_families:
+            QTimer.singleShot(0, self.add_font_batch)
+        else:
+            # The current item follows the sort, so no font change is emitted
+            self.font_combo.blockSignals(True)
+            self.font_combo.model().sort(0)
+            self.font_combo.blockSignals(False)
+
+    def on_font_change(self, family):
+        self.config_manager.set("font_family", family)
 
     def on_size_change(self, value):
         self.config_manager.set("font_size", value)
@@ -131,6 +276,9 @@ class SettingsWindow(QDialog):
     def on_provider_change(self, text):
         self.config_manager.set("provider", text)
 
+    def on_secondary_change(self, text):
+        self.config_manager.set("secondary_lyric", text)
+
     def on_align_change(self, text):
         self.config_manager.set("alignment", text)
 